@@ -6,7 +6,7 @@ Access this functionality from :py:module:`snakeoil.osutils` instead
 
 __all__ = (
     "mmap_and_close", "readlines_iter", "native_readlines",
-    "native_readfile",
+    "native_readfile", "native_readfile_bytes",
 )
 
 import errno
@@ -60,9 +60,6 @@ class readlines_iter:
     def __iter__(self):
         return self.iterable
 
-def _native_readlines_shim(*args, **kwds):
-    return native_readlines('r', *args, **kwds)
-
 def native_readlines(mode, mypath, strip_whitespace=True, swallow_missing=False,
                      none_on_missing=False, encoding=None):
     """Read a file, yielding each line.
@@ -73,7 +70,6 @@ def native_readlines(mode, mypath, strip_whitespace=True, swallow_missing=False,
     :param none_on_missing: if the file is missing, return None, else
         if the file is missing return an empty iterable
     """
-    handle = iterable = None
     try:
         handle = open(mypath, mode, encoding=encoding)
     except IOError as ie:
@@ -84,26 +80,69 @@ def native_readlines(mode, mypath, strip_whitespace=True, swallow_missing=False,
         return readlines_iter(iter([]), None, close=False)
 
     mtime = os.fstat(handle.fileno()).st_mtime
-    if not iterable:
-        iterable = iter(handle)
+    iterable = iter(handle)
     if not strip_whitespace:
         return readlines_iter(iterable, mtime)
     return readlines_iter(_strip_whitespace_filter(iterable), mtime, source=handle)
 
 
-def _strip_whitespace_filter(iterable):
+def _native_strip_whitespace_filter(iterable):
     for line in iterable:
         yield line.strip()
 
 
+try:
+    from ._readlines import strip_whitespace_filter as _strip_whitespace_filter
+except ImportError:
+    _strip_whitespace_filter = _native_strip_whitespace_filter
+
+
 def _py2k_ascii_strict_filter(source):
     for line in source:
-        if any((0x80 & ord(char)) for char in line):
+        # isascii() scans a machine word at a time in C
+        if not line.isascii():
             raise ValueError("character ordinal over 127")
         yield line
 
-def _native_readfile_shim(*args, **kwds):
-    return native_readfile('r', *args, **kwds)
+_posix_fadvise = getattr(os, 'posix_fadvise', None)
+
+
+def native_readfile_bytes(mypath, none_on_missing=False):
+    """Read a file in binary mode, returning the contents.
+
+    This reads directly via the fd, skipping the buffered io layer entirely
+    and hinting the kernel that the file is going to be read sequentially.
+
+    :param mypath: fs path for the file to read
+    :param none_on_missing: whether to return None if the file is missing,
+        else through the exception
+    """
+    try:
+        fd = os.open(mypath, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError as oe:
+        if none_on_missing and oe.errno in (errno.ENOENT, errno.ENOTDIR):
+            return None
+        raise
+
+    try:
+        size = os.fstat(fd).st_size
+        if size and _posix_fadvise is not None:
+            _posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # st_size is just a hint (procfs and the like report 0), so always
+        # read until EOF
+        chunks = [os.read(fd, size)] if size else []
+        while True:
+            chunk = os.read(fd, mmap.PAGESIZE * 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+    if len(chunks) == 1:
+        return chunks[0]
+    return b''.join(chunks)
+
 
 def native_readfile(mode, mypath, none_on_missing=False, encoding=None):
     """Read a file, returning the contents.
@@ -112,6 +151,9 @@ def native_readfile(mode, mypath, none_on_missing=False, encoding=None):
     :param none_on_missing: whether to return None if the file is missing,
         else through the exception
     """
+    if mode == 'rb':
+        return native_readfile_bytes(mypath, none_on_missing)
+
     f = None
     try:
         try:
@@ -2,7 +2,8 @@
 # cython: language_level = 3
 
 from cpython.bytes cimport PyBytes_AS_STRING
-from libc.string cimport strdup
+from cpython.unicode cimport PyUnicode_AsUTF8
+from libc.string cimport strdup, strlen
 from libc.stdio cimport snprintf
 from libc.stdlib cimport atoi, malloc, free
 from posix.unistd cimport close, getpid
@@ -31,11 +32,20 @@ cdef bytes _chars(s):
 
 def normpath(old_path):
     """Normalize a path entry."""
-    cdef char *path = strdup(PyBytes_AS_STRING(_chars(old_path)))
-    if not path:
-        raise MemoryError()
-    cdef char *read = path
-    cdef char *new_path = strdup(path)
+    cdef bint is_unicode = isinstance(old_path, unicode)
+    cdef bytes old_bytes
+    cdef const char *path
+
+    # read straight from the cached utf8 form of str objects (a no-copy
+    # lookup for ascii) or the bytes buffer; only the output gets allocated
+    if is_unicode:
+        path = PyUnicode_AsUTF8(old_path)
+    else:
+        old_bytes = _chars(old_path)
+        path = PyBytes_AS_STRING(old_bytes)
+
+    cdef char *read = <char *>path
+    cdef char *new_path = <char *>malloc(strlen(path) + 1)
     if not new_path:
         raise MemoryError()
     cdef char *write = new_path
@@ -55,14 +65,17 @@ def normpath(old_path):
             if b'.' == read[1] and (b'/' == read[2] or b'\0' == read[2]):
                 if depth == 1:
                     if is_absolute:
-                        write = new_path
+                        write = new_path + 1
                     else:
                         # why -2?  because write is at an empty char.
                         # we need to jump back past it and /
                         write -= 2
-                        while b'/' != write[0]:
+                        # don't run off the front of the buffer when the
+                        # dropped component is the first one written
+                        while write > new_path and b'/' != write[0]:
                             write -= 1
-                    write += 1
+                        if b'/' == write[0]:
+                            write += 1
                     depth = 0
                 elif depth:
                     write -= 2
@@ -86,9 +99,12 @@ def normpath(old_path):
             elif b'\0' == read[1]:
                 read += 1
             else:
-                write[0] = b'.'
-                read += 1
-                write += 1
+                # a name merely starting with '.' (e.g. '.x' or '...'), copy
+                # it whole so its remainder isn't taken for a '.' or '..'
+                while b'/' != read[0] and b'\0' != read[0]:
+                    write[0] = read[0]
+                    write += 1
+                    read += 1
         else:
             while b'/' != read[0] and b'\0' != read[0]:
                 write[0] = read[0]
@@ -97,19 +113,18 @@ def normpath(old_path):
 
     if write - 1 > new_path and b'/' == write[-1]:
         write -= 1
+    elif write == new_path:
+        # relative paths that collapse entirely refer to the current dir
+        write[0] = b'.'
+        write += 1
 
-    new_path[write - new_path] = 0
-
-    cdef bytes py_path
+    # decode directly from the C buffer to avoid an intermediate bytes object
     try:
-        py_path = new_path[:write - new_path]
+        if is_unicode:
+            return new_path[:write - new_path].decode('utf-8', 'strict')
+        return new_path[:write - new_path]
     finally:
         free(new_path)
-        free(path)
-
-    if isinstance(old_path, unicode):
-        return py_path.decode('utf-8', 'strict')
-    return py_path
 
 
 def join(*args):
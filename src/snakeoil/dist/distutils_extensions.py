@@ -526,11 +526,19 @@ class build_ext(dst_build_ext.build_ext):
     user_options = dst_build_ext.build_ext.user_options + [
         ("disable-distutils-flag-fixing", None,
          "disable fixing of issue 969718 in python, adding missing -fno-strict-aliasing"),
+        ("optimize-native", None,
+         "build with -O3 and LTO (gcc/clang only), "
+         "two-pass PGO is controlled via SNAKEOIL_PGO=generate|use (gcc only)"),
     ]
 
+    # extra flags for --optimize-native
+    optimize_compile_args = ('-O3', '-flto', '-fno-plt')
+    optimize_link_args = ('-flto',)
+
     def initialize_options(self):
         super().initialize_options()
         self.disable_distutils_flag_fixing = False
+        self.optimize_native = False
         self.default_header_install_dir = None
 
     def finalize_options(self):
@@ -615,8 +623,57 @@ class build_ext(dst_build_ext.build_ext):
                         val.append(f'-D{d}=1')
                     else:
                         val.append(f'-U{d}')
+        if self.optimize_native:
+            self._add_optimize_flags()
         super().build_extensions()
 
+    def _add_optimize_flags(self):
+        """Add optimization flags to all extensions if the compiler supports them."""
+        if self.compiler.compiler_type != 'unix':
+            log.warn('skipping native optimization flags, '
+                     f'unsupported compiler: {self.compiler.compiler_type}')
+            return
+        compiler = os.path.basename(self.compiler.compiler_so[0])
+        if not re.search(r'(gcc|clang|^cc)', compiler):
+            log.warn(f'skipping native optimization flags, unsupported compiler: {compiler}')
+            return
+
+        compile_args = list(self.optimize_compile_args)
+        link_args = list(self.optimize_link_args)
+        if sys.version_info >= (3, 9):
+            # PyMODINIT_FUNC only marks module init functions as exported
+            # from 3.9 onwards, earlier versions would fail to import
+            compile_args.append('-fvisibility=hidden')
+        pgo = os.environ.get('SNAKEOIL_PGO')
+        if pgo:
+            if pgo not in ('generate', 'use'):
+                raise DistutilsError(f'invalid SNAKEOIL_PGO value: {pgo!r} (expected generate or use)')
+            # clang needs its raw profiles merged via llvm-profdata before
+            # they can be used, only gcc's directory of .gcda files is supported
+            if self._compiler_is_clang():
+                raise DistutilsError('SNAKEOIL_PGO is only supported with gcc')
+            profile_dir = os.path.abspath(os.path.join(self.build_temp, 'pgo'))
+            flag = f'-fprofile-{pgo}={profile_dir}'
+            compile_args.append(flag)
+            link_args.append(flag)
+            if pgo == 'use':
+                # profiles won't exist for code paths the training run missed
+                compile_args.append('-Wno-missing-profile')
+
+        for ext in self.extensions:
+            ext.extra_compile_args.extend(compile_args)
+            ext.extra_link_args.extend(link_args)
+
+    def _compiler_is_clang(self):
+        """Determine if the C compiler is clang, even when invoked as cc/gcc."""
+        try:
+            p = subprocess.run(
+                [self.compiler.compiler_so[0], '--version'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        except OSError:
+            return False
+        return 'clang' in p.stdout
+
 
 class build_scripts(dst_build_scripts.build_scripts):
     """Create and build (copy and modify shebang lines) wrapper scripts."""
@@ -7,14 +7,16 @@ types = [""] + list("_%s" % x for x in ("ascii", "utf8"))
 __all__ += tuple("readfile%s" % x for x in types) + tuple("readlines%s" % x for x in types)
 del types
 
+import inspect
 import mmap
 import os
+import weakref
 from functools import partial
 
 from . import _fileutils, data_source
 from .compatibility import IGNORED_EXCEPTIONS
-from .currying import pretty_docs
 from .klass import GetAttrProxy
+from .osutils import unlink_if_exists
 
 
 def touch(fname, mode=0o644, **kwargs):
@@ -99,7 +101,7 @@ class AtomicWriteFile_mixin:
     without updating the target.
 
     If this object falls out of memory without ever being discarded nor
-    closed, the contents are discarded and a warning is issued.
+    closed, the contents are discarded.
     """
 
     def __init__(self, fp, binary=False, perms=None, uid=-1, gid=-1):
@@ -130,6 +132,9 @@ class AtomicWriteFile_mixin:
             if old_umask is not None:
                 os.umask(old_umask)
         self._is_finalized = False
+        # drop the tempfile if we're reaped without being closed or discarded;
+        # note the callback must not reference self
+        self._finalizer = weakref.finalize(self, unlink_if_exists, self._temp_fp)
         if perms:
             os.chmod(self._temp_fp, perms)
         if (gid, uid) != (-1, -1):
@@ -142,6 +147,7 @@ class AtomicWriteFile_mixin:
             self._real_close()
             os.unlink(self._temp_fp)
             self._is_finalized = True
+            self._finalizer.detach()
 
     def __enter__(self):
         return self
@@ -161,9 +167,7 @@ class AtomicWriteFile_mixin:
             self._real_close()
             os.rename(self._temp_fp, self._original_fp)
             self._is_finalized = True
-
-    def __del__(self):
-        self.discard()
+            self._finalizer.detach()
 
 
 class AtomicWriteFile(AtomicWriteFile_mixin):
@@ -181,11 +185,59 @@ class AtomicWriteFile(AtomicWriteFile_mixin):
     __getattr__ = GetAttrProxy("raw")
 
 
+_derived_func_template = """\
+def {name}({params}):
+    return _func({call_args})
+"""
+
+
 def _mk_pretty_derived_func(func, name_base, name, *args, **kwds):
+    """Generate a specialized version of func with args and kwds bound.
+
+    Akin to :py:func:`functools.partial`, but the bound values are compiled in
+    as constants so calls avoid partial's per invocation argument merging.
+    Bound values must be literals since they're inlined via their repr.  As
+    with partial, keyword bound parameters (and any following them) remain
+    overridable as keyword-only arguments.
+    """
     if name:
         name = '_' + name
-    return pretty_docs(partial(func, *args, **kwds),
-                       name='%s%s' % (name_base, name))
+    name = '%s%s' % (name_base, name)
+
+    parameters = inspect.signature(func).parameters
+    unknown = set(kwds).difference(parameters)
+    if unknown:
+        raise TypeError('%s() got unexpected keyword arguments: %s'
+                        % (func.__name__, ', '.join(sorted(unknown))))
+
+    params = []
+    call_args = [repr(x) for x in args]
+    kwonly = False
+    for param in tuple(parameters.values())[len(args):]:
+        if param.name in kwds:
+            default = kwds[param.name]
+        else:
+            default = param.default
+        if not kwonly and (param.name in kwds or param.kind == param.KEYWORD_ONLY):
+            params.append('*')
+            kwonly = True
+        if param.kind == param.KEYWORD_ONLY:
+            call_args.append('%s=%s' % (param.name, param.name))
+        else:
+            call_args.append(param.name)
+        if default is param.empty:
+            params.append(param.name)
+        else:
+            params.append('%s=%r' % (param.name, default))
+
+    namespace = {'_func': func}
+    exec(_derived_func_template.format(
+        name=name, params=', '.join(params), call_args=', '.join(call_args)),
+        namespace)
+    derived = namespace[name]
+    derived.__module__ = func.__module__
+    derived.__doc__ = func.__doc__
+    return derived
 
 
 _mk_readfile = partial(
@@ -36,13 +36,14 @@ pretty quickly.
 __all__ = (
     'abspath', 'abssymlink', 'ensure_dirs', 'join', 'pjoin', 'listdir_files',
     'listdir_dirs', 'listdir', 'readdir', 'normpath', 'unlink_if_exists',
-    'supported_systems',
+    'unlink_all_if_exists', 'supported_systems',
 )
 
 import errno
 import os
 import stat
 import sys
+from functools import lru_cache
 
 # No name '_readdir' in module osutils
 # pylint: disable=E0611
@@ -135,47 +136,56 @@ def ensure_dirs(path, gid=-1, uid=-1, mode=0o777, minimal=True):
     try:
         st = os.stat(path)
     except OSError:
-        base = os.path.sep
         try:
             um = os.umask(0)
             # if the dir perms would lack +wx, we have to force it
             force_temp_perms = ((mode & 0o300) != 0o300)
             resets = []
             apath = normpath(os.path.abspath(path))
-            sticky_parent = False
 
-            for directory in apath.split(os.path.sep):
-                base = join(base, directory)
+            # walk up from the target to find the deepest existing ancestor so
+            # only the missing components get touched, rather than stat'ing
+            # every component from the root down
+            missing = []
+            base = apath
+            os_stat = os.stat
+            dirname = os.path.dirname
+            while True:
                 try:
-                    st = os.stat(base)
-                    if not stat.S_ISDIR(st.st_mode):
-                        # one of the path components isn't a dir
+                    st = os_stat(base)
+                    break
+                except OSError:
+                    missing.append(base)
+                    parent = dirname(base)
+                    if parent == base:
                         return False
+                    base = parent
 
-                    # if it's a subdir, we need +wx at least
-                    if apath != base:
-                        sticky_parent = (st.st_mode & stat.S_ISGID)
+            if not stat.S_ISDIR(st.st_mode):
+                # one of the path components isn't a dir
+                return False
+            sticky_parent = (st.st_mode & stat.S_ISGID)
 
+            for base in reversed(missing):
+                # nothing exists.
+                try:
+                    if force_temp_perms:
+                        if not _safe_mkdir(base, 0o700):
+                            return False
+                        resets.append(base)
+                    else:
+                        if not _safe_mkdir(base, mode):
+                            return False
+                        if base == apath and sticky_parent:
+                            resets.append(base)
+                        if gid != -1 or uid != -1:
+                            os.chown(base, uid, gid)
                 except OSError:
-                    # nothing exists.
-                    try:
-                        if force_temp_perms:
-                            if not _safe_mkdir(base, 0o700):
-                                return False
-                            resets.append((base, mode))
-                        else:
-                            if not _safe_mkdir(base, mode):
-                                return False
-                            if base == apath and sticky_parent:
-                                resets.append((base, mode))
-                            if gid != -1 or uid != -1:
-                                os.chown(base, uid, gid)
-                    except OSError:
-                        return False
+                    return False
 
             try:
-                for base, m in reversed(resets):
-                    os.chmod(base, m)
+                for base in reversed(resets):
+                    os.chmod(base, mode)
                     if gid != -1 or uid != -1:
                         os.chown(base, uid, gid)
             except OSError:
@@ -212,9 +222,14 @@ def abssymlink(path):
         a symlink
     """
     mylink = os.readlink(path)
-    if mylink[0] != '/':
-        mydir = os.path.dirname(path)
-        mylink = mydir + '/' + mylink
+    if isinstance(mylink, bytes):
+        sep, pardir = b'/', b'..'
+    else:
+        sep, pardir = '/', '..'
+    if not mylink.startswith(sep):
+        # relative targets are resolved against the link's directory; normpath
+        # drops the link's name via '..', avoiding a separate dirname() split
+        mylink = sep.join((os.fspath(path), pardir, mylink))
     return normpath(mylink)
 
 
@@ -271,7 +286,9 @@ native_join = os.path.join
 try:
     from .._posix import join, normpath
 except ImportError:
-    normpath = native_normpath
+    # normpath is pure and consumers tend to hit the same paths repeatedly, so
+    # the (comparatively slow) fallback is worth memoizing
+    normpath = lru_cache(maxsize=8192)(native_normpath)
     join = native_join
 
 
@@ -309,14 +326,17 @@ def fallback_access(path, mode, root=0):
         # py3k doesn't like octal syntax; this is 0111
         return bool(st.st_mode & 73)
 
-    mygroups = os.getgroups()
-
+    # select the octet that applies (user, group, else other); note the group
+    # list is only pulled when it's actually needed.  uid/groups aren't cached
+    # since they can change mid process (privilege dropping after a fork).
     if myuid == st.st_uid:
-        # shift to the user octet, filter to 3 bits, verify intersect.
-        return mode == (mode & ((st.st_mode >> 6) & 0x7))
-    if st.st_gid in mygroups:
-        return mode == (mode & ((st.st_mode >> 3) & 0x7))
-    return mode == (mode & (st.st_mode & 0x7))
+        shift = 6
+    elif st.st_gid in os.getgroups():
+        shift = 3
+    else:
+        shift = 0
+    # verify the requested bits are a subset of that octet
+    return not (mode & ~((st.st_mode >> shift) & 7))
 
 
 if os.uname()[0].lower() == 'sunos':
@@ -338,6 +358,24 @@ def unlink_if_exists(path):
             raise
 
 
+def unlink_all_if_exists(*paths):
+    """wrap os.unlink for multiple paths, ignoring any that don't exist
+
+    Unlike looping over :py:func:`unlink_if_exists`, the lookups are resolved
+    once for the whole batch.
+
+    :param paths: non directory targets to ensure don't exist
+    """
+    unlink = os.unlink
+    enoent = errno.ENOENT
+    for path in paths:
+        try:
+            unlink(path)
+        except EnvironmentError as e:
+            if e.errno != enoent:
+                raise
+
+
 def sizeof_fmt(size, binary=True):
     if binary:
         units = ('B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB', 'ZiB', 'YiB')
@@ -0,0 +1,352 @@
+# distutils: language = c
+# cython: language_level = 3
+
+"""Extension version of :py:mod:`snakeoil.osutils.native_readdir`.
+
+Entries are classified using the d_type reported alongside each name, so stat
+calls are only needed for symlinks being followed or on filesystems that don't
+fill in d_type; those are done via fstatat(2) relative to the already open
+directory, so entry paths are never rebuilt nor resolved from scratch.  On
+Linux, entries are pulled via getdents64(2) into a large buffer, requiring far
+fewer syscalls for big directories than readdir(3).
+"""
+
+import os
+
+from cpython.bytes cimport PyBytes_FromString
+from cpython.exc cimport PyErr_SetFromErrnoWithFilenameObject
+from libc.errno cimport ENOENT, errno
+from libc.stdlib cimport free, malloc
+from posix.fcntl cimport AT_SYMLINK_NOFOLLOW, O_CLOEXEC, O_DIRECTORY, O_RDONLY
+from posix.fcntl cimport open as c_open
+from posix.stat cimport (S_IFBLK, S_IFCHR, S_IFDIR, S_IFIFO, S_IFLNK, S_IFMT,
+                         S_IFREG, S_IFSOCK, fstatat, struct_stat)
+from posix.types cimport mode_t
+from posix.unistd cimport close
+
+pjoin = os.path.join
+
+
+cdef extern from "Python.h":
+    object PyUnicode_DecodeFSDefault(const char *s)
+
+
+cdef extern from "<dirent.h>" nogil:
+    ctypedef struct DIR
+    cdef struct dirent:
+        unsigned char d_type
+        char d_name[1]
+    DIR *fdopendir(int fd)
+    dirent *c_readdir "readdir"(DIR *dirp)
+    int closedir(DIR *dirp)
+    enum:
+        DT_UNKNOWN
+        DT_FIFO
+        DT_CHR
+        DT_DIR
+        DT_BLK
+        DT_REG
+        DT_LNK
+        DT_SOCK
+
+
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #ifdef __linux__
+    #include <sys/syscall.h>
+    #include <unistd.h>
+    #endif
+
+    #if defined(__linux__) && defined(SYS_getdents64)
+    #define SNAKEOIL_HAVE_GETDENTS64 1
+    #else
+    #define SNAKEOIL_HAVE_GETDENTS64 0
+    #endif
+
+    /* glibc doesn't export the raw kernel record layout */
+    struct snakeoil_dirent64 {
+        uint64_t d_ino;
+        int64_t d_off;
+        unsigned short d_reclen;
+        unsigned char d_type;
+        char d_name[];
+    };
+
+    /* cython treats assignment to a cimported errno as a new local */
+    static void snakeoil_clear_errno(void) {
+        errno = 0;
+    }
+
+    static long snakeoil_getdents64(int fd, char *buf, size_t nbytes) {
+    #if SNAKEOIL_HAVE_GETDENTS64
+        return syscall(SYS_getdents64, fd, buf, nbytes);
+    #else
+        errno = ENOSYS;
+        return -1;
+    #endif
+    }
+    """
+    bint SNAKEOIL_HAVE_GETDENTS64
+    struct snakeoil_dirent64:
+        unsigned short d_reclen
+        unsigned char d_type
+        char *d_name
+    void snakeoil_clear_errno() nogil
+    long snakeoil_getdents64(int fd, char *buf, size_t nbytes) nogil
+
+
+# glibc's readdir(3) only requests 32KiB of entries per syscall
+cdef enum:
+    GETDENTS_BUFSIZE = 256 * 1024
+
+
+# getdents64(2) is used when available; cleared by tests to exercise readdir(3)
+_use_getdents = True
+
+
+cdef inline bint _is_dot_entry(const char *name):
+    """Check if a name is either '.' or '..'."""
+    return name[0] == b'.' and (
+        name[1] == b'\0' or (name[1] == b'.' and name[2] == b'\0'))
+
+
+cdef class _DirStream:
+    """Iterate over the raw entries of a directory."""
+
+    cdef object path
+    cdef int fd
+    cdef DIR *dirp
+    cdef char *buf
+    cdef long nread
+    cdef long bpos
+
+    def __cinit__(self, path):
+        self.path = path
+        self.fd = -1
+        self.dirp = NULL
+        self.buf = NULL
+        self.nread = 0
+        self.bpos = 0
+
+        cdef bytes bpath = os.fsencode(path)
+        if b'\0' in bpath:
+            raise ValueError('embedded null byte')
+        self.fd = c_open(bpath, O_RDONLY | O_DIRECTORY | O_CLOEXEC)
+        if self.fd < 0:
+            PyErr_SetFromErrnoWithFilenameObject(OSError, path)
+
+        if SNAKEOIL_HAVE_GETDENTS64 and _use_getdents:
+            self.buf = <char *>malloc(GETDENTS_BUFSIZE)
+            if self.buf == NULL:
+                raise MemoryError()
+        else:
+            self.dirp = fdopendir(self.fd)
+            if self.dirp == NULL:
+                PyErr_SetFromErrnoWithFilenameObject(OSError, path)
+
+    def __dealloc__(self):
+        if self.dirp != NULL:
+            # releases the underlying fd as well
+            closedir(self.dirp)
+        elif self.fd >= 0:
+            close(self.fd)
+        free(self.buf)
+
+    cdef int next(self, const char **name, unsigned char *d_type) except -1:
+        """Fetch the next entry, skipping '.' and '..'.
+
+        Returns 1 if an entry was found, 0 if the directory is exhausted.
+        """
+        cdef snakeoil_dirent64 *d
+        cdef dirent *entry
+        cdef long nread
+
+        while True:
+            if self.dirp != NULL:
+                snakeoil_clear_errno()
+                entry = c_readdir(self.dirp)
+                if entry == NULL:
+                    if errno:
+                        PyErr_SetFromErrnoWithFilenameObject(OSError, self.path)
+                    return 0
+                name[0] = entry.d_name
+                d_type[0] = entry.d_type
+            else:
+                if self.bpos >= self.nread:
+                    with nogil:
+                        nread = snakeoil_getdents64(self.fd, self.buf, GETDENTS_BUFSIZE)
+                    if nread < 0:
+                        PyErr_SetFromErrnoWithFilenameObject(OSError, self.path)
+                    elif nread == 0:
+                        return 0
+                    self.nread = nread
+                    self.bpos = 0
+                d = <snakeoil_dirent64 *>(self.buf + self.bpos)
+                self.bpos += d.d_reclen
+                name[0] = d.d_name
+                d_type[0] = d.d_type
+
+            if not _is_dot_entry(name[0]):
+                return 1
+
+    cdef int stat_entry(self, const char *name, bint follow_symlinks,
+                        mode_t *mode) except -1:
+        """Stat an entry relative to the directory.
+
+        Returns 1 if the entry's mode was retrieved, 0 if a followed symlink
+        is dangling.
+        """
+        cdef struct_stat st
+        cdef int flags = 0 if follow_symlinks else AT_SYMLINK_NOFOLLOW
+
+        if fstatat(self.fd, name, &st, flags) < 0:
+            if follow_symlinks and errno == ENOENT:
+                return 0
+            PyErr_SetFromErrnoWithFilenameObject(
+                OSError, pjoin(self.path, os.fsdecode(name)))
+        mode[0] = st.st_mode
+        return 1
+
+
+cdef inline object _decode(const char *name, bint as_bytes):
+    """Convert an entry name to the same type as the requested path."""
+    if as_bytes:
+        return PyBytes_FromString(name)
+    return PyUnicode_DecodeFSDefault(name)
+
+
+cdef list _listdir_kind(path, unsigned char wanted, mode_t wanted_fmt,
+                        bint follow_symlinks):
+    """Return the entries of a directory matching a given file type."""
+    cdef _DirStream stream = _DirStream(path)
+    cdef bint as_bytes = isinstance(os.fspath(path), bytes)
+    cdef const char *name
+    cdef unsigned char d_type
+    cdef mode_t mode
+    cdef list result = []
+
+    while stream.next(&name, &d_type):
+        if d_type == wanted:
+            result.append(_decode(name, as_bytes))
+        elif d_type == DT_UNKNOWN or (d_type == DT_LNK and follow_symlinks):
+            # filesystem doesn't report file types or the symlink target
+            # needs to be checked, fallback to stat
+            if (stream.stat_entry(name, follow_symlinks, &mode) and
+                    (mode & S_IFMT) == wanted_fmt):
+                result.append(_decode(name, as_bytes))
+    return result
+
+
+def listdir(path):
+    """
+    Return a list of all entries within a directory
+
+    :param path: directory to scan
+    :return: list of entries within `path`
+    """
+    cdef _DirStream stream = _DirStream(path)
+    cdef bint as_bytes = isinstance(os.fspath(path), bytes)
+    cdef const char *name
+    cdef unsigned char d_type
+    cdef list result = []
+
+    while stream.next(&name, &d_type):
+        result.append(_decode(name, as_bytes))
+    return result
+
+
+def listdir_dirs(path, followSymlinks=True):
+    """
+    Return a list of all subdirectories within a directory
+
+    :param path: directory to scan
+    :param followSymlinks: this controls if symlinks are resolved.
+        If True and the symlink resolves to a directory, it is returned,
+        else if False it isn't returned.
+    :return: list of directories within `path`
+    """
+    return _listdir_kind(path, DT_DIR, S_IFDIR, followSymlinks)
+
+
+def listdir_files(path, followSymlinks=True):
+    """
+    Return a list of all files within a directory
+
+    :param path: directory to scan
+    :param followSymlinks: this controls if symlinks are resolved.
+        If True and the symlink resolves to a file, it is returned,
+        else if False it isn't returned.
+    :return: list of files within `path`
+    """
+    return _listdir_kind(path, DT_REG, S_IFREG, followSymlinks)
+
+
+cdef object _d_type_name(unsigned char d_type):
+    """Map a d_type to its filetype name, None if it's unknown."""
+    if d_type == DT_REG:
+        return "file"
+    elif d_type == DT_DIR:
+        return "directory"
+    elif d_type == DT_LNK:
+        return "symlink"
+    elif d_type == DT_CHR:
+        return "chardev"
+    elif d_type == DT_BLK:
+        return "block"
+    elif d_type == DT_SOCK:
+        return "socket"
+    elif d_type == DT_FIFO:
+        return "fifo"
+    return None
+
+
+cdef object _mode_type_name(mode_t mode):
+    """Map a stat mode to its filetype name, mirroring
+    :py:data:`snakeoil.osutils.native_readdir.d_type_mapping`.
+
+    This is done inline rather than by importing that mapping since it would
+    pull in the native module and its dependencies at import time.
+    """
+    cdef mode_t fmt = mode & S_IFMT
+    if fmt == S_IFREG:
+        return "file"
+    elif fmt == S_IFDIR:
+        return "directory"
+    elif fmt == S_IFLNK:
+        return "symlink"
+    elif fmt == S_IFCHR:
+        return "chardev"
+    elif fmt == S_IFBLK:
+        return "block"
+    elif fmt == S_IFSOCK:
+        return "socket"
+    elif fmt == S_IFIFO:
+        return "fifo"
+    raise KeyError(fmt)
+
+
+def readdir(path):
+    """
+    Given a directory, return a list of (filename, filetype)
+
+    see :py:data:`snakeoil.osutils.native_readdir.d_type_mapping` for the
+    translation used
+
+    :param path: path of a directory to scan
+    :return: list of (filename, filetype)
+    """
+    cdef _DirStream stream = _DirStream(path)
+    cdef bint as_bytes = isinstance(os.fspath(path), bytes)
+    cdef const char *name
+    cdef unsigned char d_type
+    cdef mode_t mode
+    cdef list result = []
+
+    while stream.next(&name, &d_type):
+        kind = _d_type_name(d_type)
+        if kind is None:
+            stream.stat_entry(name, False, &mode)
+            kind = _mode_type_name(mode)
+        result.append((_decode(name, as_bytes), kind))
+    return result
@@ -1,14 +1,17 @@
 import errno
 import gc
+import inspect
 import mmap
 import os
 import time
+from functools import partial
 
 pjoin = os.path.join
 
 import pytest
 from snakeoil import _fileutils, currying, fileutils
 from snakeoil.fileutils import AtomicWriteFile, write_file
+from snakeoil.test import mk_cpy_loadable_testcase
 from snakeoil.test.fixtures import RandomPath, TempDir
 
 
@@ -97,6 +100,19 @@ class TestAtomicWriteFile(TempDir):
         assert fileutils.readfile_ascii(fp) == "me"
         assert len(os.listdir(self.dir)) == 1
 
+    def test_del_after_close(self):
+        # reaping a closed instance shouldn't touch a newer tempfile
+        fp = pjoin(self.dir, "target")
+        af = self.kls(fp)
+        af.write("me")
+        af.close()
+        af2 = self.kls(fp)
+        af2.write("dar")
+        del af
+        gc.collect()
+        af2.close()
+        assert fileutils.readfile_ascii(fp) == "dar"
+
     def test_close(self):
         # verify that we handle multiple closes; no exception is good.
         af = self.kls(pjoin(self.dir, "target"))
@@ -179,6 +195,49 @@ class Test_readfile(TempDir):
         assert self.func(pjoin(fp, 'extra'), True) == None
 
 
+class TestDerivedFuncs:
+
+    func = staticmethod(fileutils._mk_pretty_derived_func)
+
+    def test_introspection(self):
+        func = fileutils.readfile_utf8
+        assert func.__name__ == 'readfile_utf8'
+        assert func.__doc__ == _fileutils.native_readfile.__doc__
+
+    def test_signatures(self):
+        # must match what functools.partial would expose
+        for name, func, args, kwds in (
+                ('readfile_ascii', _fileutils.native_readfile, ('rt',), {}),
+                ('readfile_bytes', _fileutils.native_readfile, ('rb',), {}),
+                ('readfile_utf8', _fileutils.native_readfile, ('r',), {'encoding': 'utf8'}),
+                ('readlines_ascii', _fileutils.native_readlines, ('r',), {'encoding': 'ascii'}),
+                ('readlines_bytes', _fileutils.native_readlines, ('rb',), {}),
+                ('readlines_utf8', _fileutils.native_readlines, ('r',), {'encoding': 'utf8'}),
+                ):
+            assert inspect.signature(getattr(fileutils, name)) == \
+                inspect.signature(partial(func, *args, **kwds)), name
+
+    def test_kwonly(self):
+        def func(mode, path, flag=False, *, extra=None):
+            return mode, path, flag, extra
+        derived = self.func(func, 'func', 'foo', 'r', flag=True)
+        assert str(inspect.signature(derived)) == '(path, *, flag=True, extra=None)'
+        assert derived('p') == ('r', 'p', True, None)
+        assert derived('p', flag=False, extra=1) == ('r', 'p', False, 1)
+
+    def test_override_bound_kwds(self, tmp_path):
+        path = str(tmp_path / 'file')
+        write_file(path, 'wb', '\xe4'.encode('latin-1'))
+        assert fileutils.readfile(path, encoding='latin-1') == '\xe4'
+        assert list(fileutils.readlines(path, encoding='latin-1')) == ['\xe4']
+        with pytest.raises(UnicodeDecodeError):
+            fileutils.readfile(path)
+
+    def test_unknown_kwds(self):
+        with pytest.raises(TypeError):
+            self.func(_fileutils.native_readfile, 'readfile', 'bad', 'r', nonexistent=True)
+
+
 class Test_readfile_ascii(Test_readfile):
     func = staticmethod(fileutils.readfile_ascii)
 
@@ -286,13 +345,17 @@ class TestBrokenStats:
         for path in self.test_cases:
             self._check_path(path, fileutils.readfile)
 
+    def test_readfile_bytes(self):
+        for path in self.test_cases:
+            self._check_path(path, fileutils.readfile_bytes, mode='rb')
+
     def test_readlines(self):
         for path in self.test_cases:
             self._check_path(path, fileutils.readlines, True)
 
-    def _check_path(self, path, func, split_it=False):
+    def _check_path(self, path, func, split_it=False, mode='r'):
         try:
-            with open(path, 'r') as handle:
+            with open(path, mode) as handle:
                 data = handle.read()
         except EnvironmentError as e:
             if e.errno not in (errno.ENOENT, errno.EPERM):
@@ -308,6 +371,20 @@ class TestBrokenStats:
         assert func_data == data
 
 
+class Test_ascii_strict_filter:
+
+    func = staticmethod(_fileutils._py2k_ascii_strict_filter)
+
+    def test_ascii(self):
+        for lines in (['foo\n', 'bar'], [b'foo\n', b'bar']):
+            assert list(self.func(lines)) == lines
+
+    def test_non_ascii(self):
+        for lines in (['foo\n', 'b\xe4r'], [b'foo\n', b'b\xc3\xa4r']):
+            with pytest.raises(ValueError):
+                list(self.func(lines))
+
+
 class Test_mmap_or_open_for_read(TempDir):
 
     func = staticmethod(fileutils.mmap_or_open_for_read)
@@ -352,3 +429,54 @@ class Test_mmap_and_close(TempDir):
                 m.close()
             if fd is not None:
                 os.close(fd)
+
+
+class Test_native_strip_whitespace_filter:
+
+    func = staticmethod(_fileutils._native_strip_whitespace_filter)
+
+    def test_strip(self):
+        assert list(self.func([' foo\n', 'bar\t', b' dar '])) == ['foo', 'bar', b'dar']
+        assert list(self.func([])) == []
+
+    def test_whitespace(self):
+        # must match str.strip()/bytes.strip() exactly
+        lines = ['', ' ', 'foo', '\u3000f\xf6o\x1c\n', ' \U0001f40d \x85',
+                 b'', b' \t', b'\x0bfoo\x0c\r\n', b'\xa0foo\x1c']
+        assert list(self.func(lines)) == [x.strip() for x in lines]
+
+    def test_subclasses(self):
+        class mystr(str):
+            def strip(self):
+                return 'custom'
+        assert list(self.func([mystr(' foo ')])) == ['custom']
+
+    def test_non_string(self):
+        # a None item is an error, not the end of iteration
+        with pytest.raises(AttributeError):
+            list(self.func(['foo', None, 'bar']))
+
+    def test_errors(self):
+        def lines():
+            yield ' foo '
+            raise KeyError('bar')
+        it = self.func(lines())
+        assert next(it) == 'foo'
+        with pytest.raises(KeyError):
+            next(it)
+
+
+try:
+    from snakeoil._readlines import strip_whitespace_filter as _cpy_strip_whitespace_filter
+except ImportError:
+    _cpy_strip_whitespace_filter = None
+
+
+@pytest.mark.skipif(_cpy_strip_whitespace_filter is None, reason="extension isn't compiled")
+class Test_cpy_strip_whitespace_filter(Test_native_strip_whitespace_filter):
+    func = staticmethod(_cpy_strip_whitespace_filter)
+
+
+Test_cpy_readlines_loaded = mk_cpy_loadable_testcase(
+    "snakeoil._readlines", "snakeoil._fileutils", "_strip_whitespace_filter",
+    "strip_whitespace_filter")
@@ -3,6 +3,7 @@
 import errno
 import grp
 import os
+import pathlib
 import stat
 import sys
 from unittest import mock
@@ -59,6 +60,60 @@ class TestNativeListDir(ReaddirCommon):
         os.symlink("foon", pjoin(self.dir, "monkeys"))
         assert self.module.listdir_files(self.dir) == ['file']
 
+    def test_symlinks(self):
+        os.symlink('file', pjoin(self.dir, 'filesym'))
+        os.symlink('dir', pjoin(self.dir, 'dirsym'))
+        os.symlink('foon', pjoin(self.dir, 'monkeys'))
+        assert sorted(self.module.listdir_files(self.dir)) == ['file', 'filesym']
+        assert sorted(self.module.listdir_dirs(self.dir)) == ['dir', 'dirsym']
+        assert self.module.listdir_files(self.dir, False) == ['file']
+        assert self.module.listdir_dirs(self.dir, False) == ['dir']
+
+    def test_symlink_loop(self):
+        loop = pjoin(self.dir, 'loop')
+        os.symlink('loop', loop)
+        for func in (self.module.listdir_files, self.module.listdir_dirs):
+            with pytest.raises(OSError) as cm:
+                func(self.dir)
+            assert cm.value.errno == errno.ELOOP
+            # not followed, so not an error
+            assert 'loop' not in func(self.dir, False)
+        with pytest.raises(OSError) as cm:
+            self.module.listdir(loop)
+        assert cm.value.errno == errno.ELOOP
+
+    def test_not_a_dir(self):
+        for func in (self.module.listdir, self.module.listdir_dirs,
+                     self.module.listdir_files):
+            with pytest.raises(NotADirectoryError):
+                func(pjoin(self.dir, 'file'))
+
+    def test_null_byte(self):
+        for func in (self.module.listdir, self.module.listdir_dirs,
+                     self.module.listdir_files):
+            with pytest.raises(ValueError):
+                func(self.dir + '\0file')
+            with pytest.raises(ValueError):
+                func(self.dir.encode() + b'\0file')
+
+    def test_path_types(self):
+        bdir = self.dir.encode()
+        assert sorted(self.module.listdir(bdir)) == [b'dir', b'fifo', b'file']
+        assert self.module.listdir_dirs(bdir) == [b'dir']
+        assert self.module.listdir_files(bdir) == [b'file']
+        pdir = pathlib.Path(self.dir)
+        assert sorted(self.module.listdir(pdir)) == ['dir', 'fifo', 'file']
+        assert self.module.listdir_dirs(pdir) == ['dir']
+        assert self.module.listdir_files(pdir) == ['file']
+
+    def test_large_dir(self):
+        # long names so the entries span multiple getdents64(2) buffers
+        names = set('%s%05i' % ('x' * 200, i) for i in range(2000))
+        for name in names:
+            touch(pjoin(self.subdir, name))
+        assert set(self.module.listdir(self.subdir)) == names
+        assert set(self.module.listdir_files(self.subdir)) == names
+
 
 class TestNativeReaddir(ReaddirCommon):
     # TODO: test char/block devices and sockets, devices might be a bit hard
@@ -80,6 +135,24 @@ class TestNativeReaddir(ReaddirCommon):
     def test_missing(self):
         return self._test_missing((self.module.readdir,))
 
+    def test_symlinks(self):
+        # symlinks are reported as such, never by their target's type
+        os.symlink('dir', pjoin(self.dir, 'dirsym'))
+        os.symlink('file', pjoin(self.dir, 'filesym'))
+        result = dict(self.module.readdir(self.dir))
+        assert result['dirsym'] == 'symlink'
+        assert result['filesym'] == 'symlink'
+
+    def test_path_types(self):
+        assert set(self.module.readdir(self.dir.encode())) == set([
+            (b"dir", "directory"), (b"file", "file"), (b"fifo", "fifo")])
+        assert set(self.module.readdir(pathlib.Path(self.dir))) == set([
+            ("dir", "directory"), ("file", "file"), ("fifo", "fifo")])
+
+    def test_null_byte(self):
+        with pytest.raises(ValueError):
+            self.module.readdir(self.dir + '\0file')
+
 
 try:
     # No name "readdir" in module osutils
@@ -99,6 +172,24 @@ class TestCPyReaddir(TestNativeReaddir):
     module = _readdir
 
 
+class _ReaddirFallback:
+    """Force the extension to use readdir(3) instead of getdents64(2)."""
+
+    @pytest.fixture(autouse=True)
+    def _no_getdents(self, monkeypatch):
+        monkeypatch.setattr(_readdir, '_use_getdents', False)
+
+
+@pytest.mark.skipif(_readdir is None, reason="extension isn't compiled")
+class TestCPyListDirFallback(_ReaddirFallback, TestCPyListDir):
+    pass
+
+
+@pytest.mark.skipif(_readdir is None, reason="extension isn't compiled")
+class TestCPyReaddirFallback(_ReaddirFallback, TestCPyReaddir):
+    pass
+
+
 class TestEnsureDirs(TempDir):
 
     def check_dir(self, path, uid, gid, mode):
@@ -232,6 +323,20 @@ class TestAbsSymlink(TempDir):
         os.mkdir(target)
         os.symlink('target', linkname)
         assert osutils.abssymlink(linkname) == target
+        assert osutils.abssymlink(linkname.encode()) == target.encode()
+
+    def test_abssymlink_relative(self):
+        subdir = pjoin(self.dir, 'dir')
+        os.mkdir(subdir)
+        os.symlink('../target', pjoin(subdir, 'link'))
+        os.symlink(pjoin(self.dir, 'target'), pjoin(subdir, 'abslink'))
+        cwd = os.getcwd()
+        try:
+            os.chdir(self.dir)
+            assert osutils.abssymlink(pjoin('dir', 'link')) == 'target'
+        finally:
+            os.chdir(cwd)
+        assert osutils.abssymlink(pjoin(subdir, 'abslink')) == pjoin(self.dir, 'target')
 
 
 class Test_Native_NormPath:
@@ -261,6 +366,9 @@ class Test_Native_NormPath:
         check('/foo/../../..', '/')
         check('/tmp/foo/../dar/', '/tmp/dar')
         check('/tmp/foo/../dar', '/tmp/dar')
+        check('foo/../dar', 'dar')
+        check('foo/../..', '..')
+        check('../foo/../..', '../..')
 
         # explicit unicode and bytes
         check('/tmṕ/föo//../dár', '/tmṕ/dár')
@@ -268,8 +376,19 @@ class Test_Native_NormPath:
         check('/föó/..', '/')
         check(b'/f\xc3\xb6\xc3\xb3/..', b'/')
 
+        # names that merely start with dots
+        check('/...', '/...')
+        check('/a/.x', '/a/.x')
+        check('/a/..x/...', '/a/..x/...')
+        check('.../..', '.')
+        check('.', '.')
+        check('a/..', '.')
+        check('//bb/.../.x/bb/.', '/bb/.../.x/bb')
+
 
-@pytest.mark.skipif(osutils.normpath is osutils.native_normpath, reason="extension isn't compiled")
+@pytest.mark.skipif(
+    getattr(osutils.normpath, "__wrapped__", osutils.normpath) is osutils.native_normpath,
+    reason="extension isn't compiled")
 class Test_Cpy_NormPath(Test_Native_NormPath):
     func = staticmethod(osutils.normpath)
 
@@ -330,6 +449,30 @@ class TestAccess(TempDir):
         assert self.func(fp, os.W_OK | os.R_OK)
         assert not self.func(fp, os.W_OK | os.R_OK | os.X_OK)
 
+    def test_fallback_nonroot(self):
+        fp = pjoin(self.dir, 'file')
+        touch(fp)
+        os.chown(fp, 1000, 1000)
+        os.chmod(fp, 0o640)
+
+        def check(uid, groups):
+            with mock.patch('snakeoil.osutils.os.getuid', return_value=uid), \
+                    mock.patch('snakeoil.osutils.os.getgroups', return_value=groups):
+                return [self.func(fp, x) for x in (os.R_OK, os.W_OK, os.X_OK)]
+
+        # owner
+        assert check(1000, []) == [True, True, False]
+        # group member
+        assert check(1001, [1000]) == [True, False, False]
+        # other
+        assert check(1001, [1001]) == [False, False, False]
+
+        # bits outside the selected octet are never satisfied by other octets
+        with mock.patch('snakeoil.osutils.os.getuid', return_value=1001), \
+                mock.patch('snakeoil.osutils.os.getgroups', return_value=[]):
+            os.chmod(fp, 0o650)
+            assert not self.func(fp, 8)
+
 
 class Test_unlink_if_exists(TempDir):
 
@@ -346,6 +489,27 @@ class Test_unlink_if_exists(TempDir):
         f(path)
 
 
+class Test_unlink_all_if_exists(TempDir):
+
+    func = staticmethod(osutils.unlink_all_if_exists)
+
+    def test_it(self):
+        f = self.func
+        paths = [pjoin(self.dir, x) for x in ('a', 'b', 'c')]
+        f()
+        f(*paths)
+        write_file(paths[0], 'w', '')
+        write_file(paths[2], 'w', '')
+        f(*paths)
+        assert not any(map(os.path.exists, paths))
+
+    def test_errors(self):
+        # non ENOENT errors still propagate
+        os.mkdir(pjoin(self.dir, 'dir'))
+        with pytest.raises(OSError):
+            self.func(pjoin(self.dir, 'missing'), pjoin(self.dir, 'dir'))
+
+
 class TestSupportedSystems:
 
     def test_supported_system(self):